@@ -1,22 +1,7 @@
 """
 API module initialization.
-This module contains the FastAPI application and endpoints.
+The FastAPI application and endpoints live in core.api; this re-exports that app.
 """
+from core.api.app import app
 
-from fastapi import FastAPI
-from fastapi.middleware.cors import CORSMiddleware
-
-app = FastAPI(
-    title="I-Medata API",
-    description="API for accessing and managing medical data",
-    version="1.0.0"
-)
-
-# Configure CORS
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"],
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-) 
\ No newline at end of file
+__all__ = ['app']
\ No newline at end of file
@@ -8,17 +8,11 @@ from typing import Dict
 from dotenv import load_dotenv, find_dotenv
 from functools import lru_cache
 
-# Set up logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-# Load environment variables from .env file
-env_path = find_dotenv()
-if env_path:
-    logger.info(f"Found .env file at: {env_path}")
-    load_dotenv(env_path)
-else:
-    logger.warning("No .env file found!")
+def _env(name: str, default: str = None):
+    """Build a dataclass default that reads an environment variable at instantiation time."""
+    return field(default_factory=lambda: os.getenv(name, default))
 
 def get_default_table_pk_map() -> Dict[str, str]:
     """Get default table primary key mapping."""
@@ -32,17 +26,17 @@ def get_default_table_pk_map() -> Dict[str, str]:
 @dataclass
 class Config:
     # PostgreSQL settings
-    postgres_host: str = os.getenv('POSTGRES_HOST', 'localhost')
-    postgres_port: int = int(os.getenv('POSTGRES_PORT', '5432'))
-    postgres_user: str = os.getenv('POSTGRES_USER', 'postgres')
-    postgres_password: str = os.getenv('POSTGRES_PASSWORD', 'postgres')
-    postgres_db: str = os.getenv('POSTGRES_DB', 'postgres')
-    
+    postgres_host: str = _env('POSTGRES_HOST', 'localhost')
+    postgres_port: int = field(default_factory=lambda: int(os.getenv('POSTGRES_PORT', '5432')))
+    postgres_user: str = _env('POSTGRES_USER', 'postgres')
+    postgres_password: str = _env('POSTGRES_PASSWORD', 'postgres')
+    postgres_db: str = _env('POSTGRES_DB', 'postgres')
+
     # AWS settings
-    aws_access_key_id: str = os.getenv('AWS_ACCESS_KEY_ID')
-    aws_secret_access_key: str = os.getenv('AWS_SECRET_ACCESS_KEY')
-    aws_region: str = os.getenv('AWS_REGION', 'us-east-1')
-    s3_bucket: str = os.getenv('S3_BUCKET', 'external-medate-exam-data')
+    aws_access_key_id: str = _env('AWS_ACCESS_KEY_ID')
+    aws_secret_access_key: str = _env('AWS_SECRET_ACCESS_KEY')
+    aws_region: str = _env('AWS_REGION', 'us-east-1')
+    s3_bucket: str = _env('S3_BUCKET', 'external-medate-exam-data')
 
     # Table primary key mapping
     table_pk_map: Dict[str, str] = field(default_factory=get_default_table_pk_map)
@@ -52,7 +46,7 @@ class Config:
         # Log AWS configuration status (safely)
         logger.info("Checking AWS credentials...")
         if self.aws_access_key_id:
-            logger.info(f"AWS Access Key ID found (starts with: {self.aws_access_key_id[:4]}...)")
+            logger.info("AWS Access Key ID found (starts with: %s...)", self.aws_access_key_id[:4])
         else:
             logger.info("AWS_ACCESS_KEY_ID not found in environment variables or .env file")
             logger.info("Will attempt to use default AWS credential chain")
@@ -62,14 +56,22 @@ class Config:
         else:
             logger.info("AWS_SECRET_ACCESS_KEY not found in environment variables or .env file")
             logger.info("Will attempt to use default AWS credential chain")
-        
-        logger.info(f"AWS Region set to: {self.aws_region}")
-        logger.info(f"S3 Bucket set to: {self.s3_bucket}")
+
+        logger.info("AWS Region set to: %s", self.aws_region)
+        logger.info("S3 Bucket set to: %s", self.s3_bucket)
 
     @property
     def postgres_url(self) -> str:
         """Get PostgreSQL connection URL."""
         return f"postgresql://{self.postgres_user}:{self.postgres_password}@{self.postgres_host}:{self.postgres_port}/{self.postgres_db}"
 
-# Create a singleton instance
-config = Config()
\ No newline at end of file
+@lru_cache(maxsize=1)
+def get_config() -> Config:
+    """Load the .env file and return the shared configuration instance."""
+    env_path = find_dotenv()
+    if env_path:
+        logger.info("Found .env file at: %s", env_path)
+        load_dotenv(env_path)
+    else:
+        logger.warning("No .env file found!")
+    return Config()
\ No newline at end of file
@@ -1,19 +1,63 @@
 """
 FastAPI application configuration and initialization.
 """
+from contextlib import asynccontextmanager
+from cachetools import TTLCache
 from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
 from fastapi.middleware.cors import CORSMiddleware
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from core.aws.aws_client import AWSClient
+from core.logging import configure_logging
+from .dependencies import get_database_url
 from .routes import main_router
 
+# Patient demographics change rarely, so lookups are cached briefly in memory
+PATIENT_CACHE_SIZE = 10_000
+PATIENT_CACHE_TTL_SECONDS = 120
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Create the shared database engine, session factory and AWS client for the application's lifetime."""
+    # Route handlers are async, so use the asyncpg driver to keep the event loop free
+    database_url = make_url(get_database_url()).set(drivername="postgresql+asyncpg")
+    app.state.engine = create_async_engine(
+        database_url,
+        pool_size=20,
+        max_overflow=40,
+        pool_recycle=1800,
+        pool_pre_ping=True,
+        query_cache_size=1200
+    )
+    app.state.session_factory = async_sessionmaker(
+        bind=app.state.engine,
+        autoflush=False,
+        expire_on_commit=False,
+        class_=AsyncSession
+    )
+    app.state.aws = AWSClient()
+    try:
+        yield
+    finally:
+        await app.state.engine.dispose()
+
 def create_app() -> FastAPI:
     """Create and configure the FastAPI application."""
+    configure_logging()
     app = FastAPI(
         title="Medical Data API",
         description="API endpoints for accessing medical data",
         version="1.0.0",
         docs_url="/api/docs",
         redoc_url="/api/redoc",
-        openapi_url="/api/openapi.json"
+        openapi_url="/api/openapi.json",
+        default_response_class=ORJSONResponse,
+        lifespan=lifespan
+    )
+    app.state.patient_cache = TTLCache(
+        maxsize=PATIENT_CACHE_SIZE,
+        ttl=PATIENT_CACHE_TTL_SECONDS
     )
 
     # Configure CORS
@@ -31,4 +75,4 @@ def create_app() -> FastAPI:
     return app
 
 # Create the application instance
-app = create_app() 
\ No newline at end of file
+app = create_app()
\ No newline at end of file
@@ -2,6 +2,7 @@
 API dependencies package.
 """
 from .auth import verify_api_key
-from .database import get_db
+from .aws import get_aws
+from .database import get_db, get_database_url
 
-__all__ = ['verify_api_key', 'get_db'] 
\ No newline at end of file
+__all__ = ['verify_api_key', 'get_aws', 'get_db', 'get_database_url']
\ No newline at end of file
@@ -1,9 +1,14 @@
 """
 Authentication and authorization dependencies.
 """
-from fastapi import Header
+import hmac
+from fastapi import Header, HTTPException
+
+# In production, this should be loaded from a secure key store
+_VALID_KEYS = frozenset({"test_api_key"})
 
 def verify_api_key(x_api_key: str = Header(...)) -> bool:
-    """Verify API key from header."""
-    # In production, this should be a secure comparison against stored keys
-    return x_api_key == "test_api_key" 
\ No newline at end of file
+    """Verify API key from header using a constant-time comparison."""
+    if not any(hmac.compare_digest(x_api_key, key) for key in _VALID_KEYS):
+        raise HTTPException(status_code=401, detail="Invalid API key")
+    return True
\ No newline at end of file
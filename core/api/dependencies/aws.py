@@ -0,0 +1,9 @@
+"""
+AWS dependencies.
+"""
+from fastapi import Request
+from core.aws.aws_client import AWSClient
+
+def get_aws(request: Request) -> AWSClient:
+    """Get the application's shared AWS client."""
+    return request.app.state.aws
\ No newline at end of file
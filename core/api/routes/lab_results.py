@@ -1,11 +1,14 @@
 """
 Lab results related API endpoints.
 """
-from fastapi import APIRouter, HTTPException, Depends, Header
+from fastapi import APIRouter, HTTPException, Depends
 from typing import Optional, Dict, Any
-from datetime import datetime
+from datetime import date
 import time
-from sqlalchemy.orm import Session
+from functools import lru_cache
+from sqlalchemy import text
+from sqlalchemy.sql.elements import TextClause
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from core.api.dependencies import get_db, verify_api_key
 
@@ -14,56 +17,60 @@ router = APIRouter(
     tags=["lab_results"]
 )
 
-@router.get("")
+@lru_cache(maxsize=None)
+def _lab_results_query(has_from_date: bool, has_to_date: bool) -> TextClause:
+    """Build the lab results query once per combination of date filters."""
+    join_predicates = ["lt.patient_id = p.patient_id"]
+    if has_from_date:
+        join_predicates.append("lr.performed_date >= :from_date")
+    if has_to_date:
+        join_predicates.append("lr.performed_date <= :to_date")
+    
+    query = f"""
+        SELECT lr.*, lt.test_name
+        FROM medate_exam.patient_information p
+        LEFT JOIN (
+            medate_exam.lab_results lr
+            JOIN medate_exam.lab_tests lt ON lr.test_id = lt.test_id
+        ) ON {" AND ".join(join_predicates)}
+        WHERE p.patient_id = :patient_id
+    """
+    return text(query)
+
+@router.get("", response_model=None)
 async def get_patient_lab_results(
     patient_id: str,
-    from_date: Optional[str] = None,
-    to_date: Optional[str] = None,
-    db: Session = Depends(get_db),
-    x_api_key: str = Header(...)
+    from_date: Optional[date] = None,
+    to_date: Optional[date] = None,
+    db: AsyncSession = Depends(get_db),
+    _: bool = Depends(verify_api_key)
 ) -> Dict[str, Any]:
     """Get lab results for a patient."""
-    # Verify API key
-    if not verify_api_key(x_api_key):
-        raise HTTPException(status_code=401, detail="Invalid API key")
-    
     # Record start time for performance monitoring
     start_time = time.time()
     
     try:
-        # First check if patient exists
-        patient_result = db.execute("""
-            SELECT patient_id
-            FROM medate_exam.patient_information
-            WHERE patient_id = :patient_id
-        """, {"patient_id": patient_id})
+        # Single round trip: the patient row anchors the LEFT JOINs, so an empty
+        # result means the patient does not exist
+        params = {"patient_id": patient_id}
+        if from_date:
+            params["from_date"] = from_date
+        if to_date:
+            params["to_date"] = to_date
         
-        if not patient_result.fetchone():
+        result = await db.execute(
+            _lab_results_query(bool(from_date), bool(to_date)),
+            params
+        )
+        rows = result.mappings().all()
+        if not rows:
             raise HTTPException(
                 status_code=404,
                 detail=f"Patient {patient_id} not found"
             )
         
-        # Build query based on date filters
-        query = """
-            SELECT lr.*, lt.test_name
-            FROM medate_exam.lab_results lr
-            JOIN medate_exam.lab_tests lt ON lr.test_id = lt.test_id
-            JOIN medate_exam.admissions a ON a.patient_id = :patient_id
-        """
-        params = {"patient_id": patient_id}
-        
-        if from_date:
-            query += " AND lr.performed_date >= :from_date"
-            params["from_date"] = from_date
-            
-        if to_date:
-            query += " AND lr.performed_date <= :to_date"
-            params["to_date"] = to_date
-            
-        # Execute query
-        result = db.execute(query, params)
-        lab_results = [dict(row) for row in result.fetchall()]
+        # A patient without matching results yields a single all-NULL row
+        lab_results = [row for row in rows if row["result_id"] is not None]
         
         # Add performance metrics
         response_time = time.time() - start_time
@@ -1,55 +1,56 @@
 """
 Patient information related API endpoints.
 """
-from fastapi import APIRouter, HTTPException, Depends, Header
+from fastapi import APIRouter, HTTPException, Depends, Request
 from typing import Dict, Any
-from datetime import datetime
 import time
-from sqlalchemy.orm import Session
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from core.api.dependencies import get_db, verify_api_key
 
+# Built once at import so SQLAlchemy's compiled cache is hit on every request
+_PATIENT_QUERY = text("""
+    SELECT *
+    FROM medate_exam.patient_information
+    WHERE patient_id = :patient_id
+""")
+
 router = APIRouter(
     prefix="/api/v1/patients",
     tags=["patients"]
 )
 
-@router.get("/{patient_id}")
+@router.get("/{patient_id}", response_model=None)
 async def get_patient(
     patient_id: str,
-    db: Session = Depends(get_db),
-    x_api_key: str = Header(...)
+    request: Request,
+    db: AsyncSession = Depends(get_db),
+    _: bool = Depends(verify_api_key)
 ) -> Dict[str, Any]:
     """Get patient details by ID."""
-    # Verify API key
-    if not verify_api_key(x_api_key):
-        raise HTTPException(status_code=401, detail="Invalid API key")
-    
     # Record start time for performance monitoring
     start_time = time.time()
     
     try:
-        # Query patient information
-        result = db.execute("""
-            SELECT *
-            FROM medate_exam.patient_information
-            WHERE patient_id = :patient_id
-        """, {"patient_id": patient_id})
-        
-        patient = result.fetchone()
-        if not patient:
-            raise HTTPException(
-                status_code=404,
-                detail=f"Patient {patient_id} not found"
-            )
-        
-        # Convert to dictionary
-        patient_dict = dict(patient)
+        # Serve from the in-memory cache when possible, otherwise query and populate it
+        patient_cache = request.app.state.patient_cache
+        patient = patient_cache.get(patient_id)
+        if patient is None:
+            result = await db.execute(_PATIENT_QUERY, {"patient_id": patient_id})
+            
+            patient = result.mappings().first()
+            if not patient:
+                raise HTTPException(
+                    status_code=404,
+                    detail=f"Patient {patient_id} not found"
+                )
+            patient_cache[patient_id] = patient
         
         # Add performance metrics
         response_time = time.time() - start_time
         return {
-            "data": patient_dict,
+            "data": patient,
             "metadata": {
                 "response_time_ms": round(response_time * 1000, 2)
             }
@@ -4,37 +4,104 @@ AWS client for S3 operations.
 import boto3
 import pandas as pd
 import pyarrow as pa
+import pyarrow.fs as pafs
 import pyarrow.parquet as pq
 import logging
 from io import BytesIO
 from typing import Dict, Any, List, Optional
-from config.config import config
+from config.config import get_config
+from boto3.s3.transfer import TransferConfig
+from botocore.config import Config as BotoConfig
 from botocore.exceptions import ClientError
 
 # Set up logging
 logger = logging.getLogger(__name__)
 
+# Multipart settings for uploads: objects above 8 MiB are sent as concurrent 8 MiB parts
+MULTIPART_CHUNK_SIZE = 8 * 1024 * 1024
+TRANSFER_CONFIG = TransferConfig(
+    multipart_threshold=MULTIPART_CHUNK_SIZE,
+    multipart_chunksize=MULTIPART_CHUNK_SIZE,
+    max_concurrency=10,
+    use_threads=True
+)
+
+# Connection pool large enough for a full multipart transfer plus concurrent callers,
+# with keep-alive so threads reuse warm TLS connections
+S3_CLIENT_CONFIG = BotoConfig(
+    max_pool_connections=2 * TRANSFER_CONFIG.max_request_concurrency,
+    retries={'max_attempts': 3, 'mode': 'adaptive'},
+    tcp_keepalive=True
+)
+
+# Parquet encoding for uploads: ZSTD files are smaller than Snappy at similar speed
+PARQUET_WRITE_OPTIONS = {
+    'compression': 'zstd',
+    'compression_level': 3,
+    'use_dictionary': True
+}
+
+# Maximum number of keys accepted by a single S3 DeleteObjects request
+DELETE_BATCH_SIZE = 1000
+
 class AWSClient:
     def __init__(self):
+        self.config = get_config()
+        self._s3 = None
+        self._filesystem = None
+
+    @property
+    def s3(self):
+        """S3 client, created and checked against the configured bucket on first use."""
+        if self._s3 is None:
+            self._s3 = self._create_s3_client()
+        return self._s3
+
+    @property
+    def filesystem(self) -> pafs.S3FileSystem:
+        """pyarrow S3 filesystem used for ranged, column-selective Parquet reads."""
+        if self._filesystem is None:
+            config = self.config
+            if config.aws_access_key_id and config.aws_secret_access_key:
+                self._filesystem = pafs.S3FileSystem(
+                    access_key=config.aws_access_key_id,
+                    secret_key=config.aws_secret_access_key,
+                    region=config.aws_region
+                )
+            else:
+                # Use default credential chain (environment, ~/.aws/credentials, etc.)
+                self._filesystem = pafs.S3FileSystem(region=config.aws_region)
+        return self._filesystem
+
+    @staticmethod
+    def _is_access_denied(error: OSError) -> bool:
+        """Check whether a pyarrow filesystem error was caused by missing S3 permissions."""
+        message = str(error)
+        return 'ACCESS_DENIED' in message or 'AccessDenied' in message
+
+    def _create_s3_client(self):
+        """Create the boto3 S3 client and verify access to the configured bucket."""
+        config = self.config
         try:
             logger.info("Initializing AWS S3 client...")
             
             # Only pass credentials if they are explicitly set in config
             if config.aws_access_key_id and config.aws_secret_access_key:
-                self.s3 = boto3.client(
+                s3 = boto3.client(
                     's3',
                     aws_access_key_id=config.aws_access_key_id,
                     aws_secret_access_key=config.aws_secret_access_key,
-                    region_name=config.aws_region
+                    region_name=config.aws_region,
+                    config=S3_CLIENT_CONFIG
                 )
             else:
                 # Use default credential chain (environment, ~/.aws/credentials, etc.)
-                self.s3 = boto3.client('s3', region_name=config.aws_region)
+                s3 = boto3.client('s3', region_name=config.aws_region, config=S3_CLIENT_CONFIG)
             
             # Test the credentials by checking access to the specific bucket we need
-            logger.info(f"Testing AWS credentials by checking access to bucket: {config.s3_bucket}")
+            logger.info("Testing AWS credentials by checking access to bucket: %s", config.s3_bucket)
             try:
-                self.s3.head_bucket(Bucket=config.s3_bucket)
+                s3.head_bucket(Bucket=config.s3_bucket)
                 logger.info("Successfully verified bucket access")
             except ClientError as e:
                 error = e.response['Error']
@@ -48,7 +115,7 @@ class AWSClient:
         except ClientError as e:
             error_code = e.response['Error']['Code']
             error_message = e.response['Error']['Message']
-            logger.error(f"AWS Error: {error_code} - {error_message}")
+            logger.error("AWS Error: %s - %s", error_code, error_message)
             
             if error_code == 'InvalidAccessKeyId':
                 raise ValueError("Invalid AWS credentials. Please check your AWS credentials in environment variables, .env file, or ~/.aws/credentials")
@@ -59,17 +126,27 @@ class AWSClient:
             else:
                 raise
 
-    def read_parquet(self, bucket: str, key: str) -> pd.DataFrame:
-        """Read a Parquet file from S3 into a pandas DataFrame."""
+        return s3
+
+    def read_parquet(self, bucket: str, key: str, columns: Optional[List[str]] = None) -> pd.DataFrame:
+        """Read a Parquet file from S3 into a pandas DataFrame.
+
+        pyarrow coalesces the column chunks into a few concurrent byte-range requests,
+        and only the requested columns are downloaded when ``columns`` is given.
+        """
         try:
-            response = self.s3.get_object(Bucket=bucket, Key=key)
-            buffer = BytesIO(response['Body'].read())
-            table = pq.read_table(buffer)
+            table = pq.read_table(
+                f"{bucket}/{key}",
+                filesystem=self.filesystem,
+                columns=columns,
+                pre_buffer=True,
+                use_threads=True
+            )
             return table.to_pandas()
-        except ClientError as e:
-            if e.response['Error']['Code'] == 'NoSuchKey':
-                raise FileNotFoundError(f"File not found in S3: {bucket}/{key}")
-            elif e.response['Error']['Code'] == '403':
+        except FileNotFoundError:
+            raise FileNotFoundError(f"File not found in S3: {bucket}/{key}")
+        except OSError as e:
+            if self._is_access_denied(e):
                 raise PermissionError(f"Access denied to S3 object: {bucket}/{key}")
             raise
 
@@ -78,9 +155,9 @@ class AWSClient:
         try:
             table = pa.Table.from_pandas(df)
             buffer = BytesIO()
-            pq.write_table(table, buffer)
+            pq.write_table(table, buffer, **PARQUET_WRITE_OPTIONS)
             buffer.seek(0)
-            self.s3.put_object(Bucket=bucket, Key=key, Body=buffer.getvalue())
+            self.s3.upload_fileobj(buffer, bucket, key, Config=TRANSFER_CONFIG)
         except ClientError as e:
             if e.response['Error']['Code'] == 'NoSuchBucket':
                 raise ValueError(f"S3 bucket does not exist: {bucket}")
@@ -97,7 +174,7 @@ class AWSClient:
             return [obj['Key'] for obj in response['Contents']]
         except ClientError as e:
             if e.response['Error']['Code'] == '403':
-                logger.warning(f"Access denied to list objects in {bucket}/{prefix}")
+                logger.warning("Access denied to list objects in %s/%s", bucket, prefix)
                 return []
             raise
 
@@ -110,20 +187,41 @@ class AWSClient:
                 raise PermissionError(f"Access denied to delete S3 object: {bucket}/{key}")
             raise
 
+    def delete_s3_objects(self, bucket: str, keys: List[str]) -> None:
+        """Delete several objects from S3 with batched DeleteObjects requests."""
+        try:
+            # DeleteObjects accepts at most 1000 keys per request
+            for start in range(0, len(keys), DELETE_BATCH_SIZE):
+                batch = keys[start:start + DELETE_BATCH_SIZE]
+                response = self.s3.delete_objects(
+                    Bucket=bucket,
+                    Delete={'Objects': [{'Key': key} for key in batch], 'Quiet': True}
+                )
+                errors = response.get('Errors', [])
+                if errors:
+                    error = errors[0]
+                    if error['Code'] == 'AccessDenied':
+                        raise PermissionError(f"Access denied to delete S3 object: {bucket}/{error['Key']}")
+                    raise RuntimeError(f"Failed to delete S3 object {bucket}/{error['Key']}: {error['Message']}")
+        except ClientError as e:
+            if e.response['Error']['Code'] == '403':
+                raise PermissionError(f"Access denied to delete S3 objects in bucket: {bucket}")
+            raise
+
     def get_parquet_schema(self, bucket: str, key: str) -> Dict[str, str]:
-        """Get schema information from a Parquet file."""
+        """Get schema information from a Parquet file, fetching only its footer."""
         try:
-            response = self.s3.get_object(Bucket=bucket, Key=key)
-            buffer = BytesIO(response['Body'].read())
-            parquet_schema = pq.read_schema(buffer)
+            parquet_schema = pq.read_schema(f"{bucket}/{key}", filesystem=self.filesystem)
             
             schema_dict = {}
             for field in parquet_schema:
                 schema_dict[field.name] = str(field.type)
             
             return schema_dict
-        except ClientError as e:
-            if e.response['Error']['Code'] == '403':
+        except FileNotFoundError:
+            raise FileNotFoundError(f"File not found in S3: {bucket}/{key}")
+        except OSError as e:
+            if self._is_access_denied(e):
                 raise PermissionError(f"Access denied to read S3 object schema: {bucket}/{key}")
             raise
 
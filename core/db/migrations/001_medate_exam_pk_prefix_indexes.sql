@@ -0,0 +1,10 @@
+-- Prefix searches on the medate_exam primary keys (id LIKE 'TEST%') can only use
+-- a btree index in a non-C collation when it is built with text_pattern_ops
+CREATE INDEX IF NOT EXISTS idx_patient_information_patient_id_prefix
+    ON medate_exam.patient_information(patient_id text_pattern_ops);
+CREATE INDEX IF NOT EXISTS idx_lab_tests_test_id_prefix
+    ON medate_exam.lab_tests(test_id text_pattern_ops);
+CREATE INDEX IF NOT EXISTS idx_lab_results_result_id_prefix
+    ON medate_exam.lab_results(result_id text_pattern_ops);
+CREATE INDEX IF NOT EXISTS idx_admissions_hospitalization_case_number_prefix
+    ON medate_exam.admissions(hospitalization_case_number text_pattern_ops);
@@ -1,65 +1,201 @@
 """
 PostgreSQL client for database operations.
 """
-from sqlalchemy import create_engine, text
-from sqlalchemy.engine import Engine
+import csv
+import threading
+from contextvars import ContextVar
+from functools import lru_cache
+from io import StringIO
+from sqlalchemy import TextClause, create_engine, text
+from sqlalchemy.engine import Connection, Engine, make_url
 import pandas as pd
-from typing import List, Dict, Any
-from config.config import config
+from typing import List, Dict, Any, Iterable, Iterator, Mapping, Optional, Tuple, Union
 from contextlib import contextmanager
-import psycopg2
-from urllib.parse import urlparse
+
+# Statements built once so SQLAlchemy's compiled cache is reused across calls
+_TABLE_SCHEMA_QUERY = text("""
+    SELECT column_name, data_type, is_nullable
+    FROM information_schema.columns
+    WHERE table_schema = :schema
+    AND table_name = :table
+    ORDER BY ordinal_position
+""")
+
+_TABLE_EXISTS_QUERY = text("""
+    SELECT EXISTS (
+        SELECT FROM information_schema.tables 
+        WHERE table_schema = :schema
+        AND table_name = :table
+    )
+""")
+
+# Engines (and their connection pools) are shared by every client with the same DSN,
+# counted by their open clients so the last one to close disposes the pool
+_ENGINES: Dict[str, Engine] = {}
+_ENGINE_REFS: Dict[str, int] = {}
+_ENGINES_LOCK = threading.Lock()
+
+# Connection opened by the outermost PostgresClient.connection() block in this context
+_ACTIVE_CONNECTION: ContextVar[Optional[Connection]] = ContextVar('_active_connection', default=None)
+
+# psycopg3 promotes a statement to a server-side prepared statement after this many executions
+PREPARE_THRESHOLD = 5
+
+# Frames smaller than this are inserted with a batched multi-row INSERT instead of COPY
+COPY_MIN_ROWS = 1000
+
+# PostgreSQL's wire protocol allows at most this many bind parameters per statement
+MAX_BIND_PARAMS = 65535
+
+def _get_engine(connection_string: str) -> Engine:
+    """Return the process-wide engine for a connection string, creating it on first use, and count the caller."""
+    with _ENGINES_LOCK:
+        engine = _ENGINES.get(connection_string)
+        if engine is None:
+            # Run PostgreSQL URLs that name no driver on psycopg3 so repeated queries are
+            # prepared server-side; an explicitly chosen driver is left alone
+            url = make_url(connection_string)
+            if url.drivername == 'postgresql':
+                url = url.set(drivername='postgresql+psycopg')
+            # prepare_threshold is a psycopg3 connection option other drivers reject
+            connect_args = {'prepare_threshold': PREPARE_THRESHOLD} if url.get_driver_name() == 'psycopg' else {}
+            engine = create_engine(
+                url,
+                pool_recycle=3600,
+                pool_size=5,
+                query_cache_size=1200,
+                connect_args=connect_args
+            )
+            _ENGINES[connection_string] = engine
+        _ENGINE_REFS[connection_string] = _ENGINE_REFS.get(connection_string, 0) + 1
+        return engine
+
+def _release_engine(connection_string: str) -> None:
+    """Drop a caller's hold on a shared engine, disposing its pool once no caller is left."""
+    with _ENGINES_LOCK:
+        _ENGINE_REFS[connection_string] -= 1
+        if _ENGINE_REFS[connection_string]:
+            return
+        del _ENGINE_REFS[connection_string]
+        engine = _ENGINES.pop(connection_string)
+    engine.dispose()
+
+@contextmanager
+def _connect(engine: Engine) -> Iterator[Connection]:
+    """Reuse the connection of an enclosing connection() block, or check out a new one."""
+    active = _ACTIVE_CONNECTION.get()
+    if active is not None and active.engine is engine:
+        yield active
+        return
+    with engine.connect() as conn:
+        yield conn
+
+@lru_cache(maxsize=256)
+def _cached_table_schema(engine: Engine, schema: str, table_name: str) -> Tuple[Dict[str, Any], ...]:
+    """Query a table's column information once per engine, schema and table."""
+    with _connect(engine) as conn:
+        result = conn.execute(_TABLE_SCHEMA_QUERY, {'schema': schema, 'table': table_name})
+        return tuple(dict(row) for row in result.mappings())
+
+@lru_cache(maxsize=256)
+def _cached_table_exists(engine: Engine, schema: str, table_name: str) -> bool:
+    """Check a table's existence once per engine, schema and table."""
+    with _connect(engine) as conn:
+        result = conn.execute(_TABLE_EXISTS_QUERY, {'schema': schema, 'table': table_name})
+        return bool(result.scalar())
+
+def _as_text(query: Union[str, TextClause]) -> TextClause:
+    """Wrap a SQL string in text(), passing through statements that callers built once up front."""
+    return query if isinstance(query, TextClause) else text(query)
+
+def _qualified_name(table) -> str:
+    """Return the schema-qualified name of a pandas SQLTable."""
+    return f'{table.schema}.{table.name}' if table.schema else table.name
+
+def _bulk_insert_values(cur, table_name: str, keys: List[str], rows: List[tuple]) -> None:
+    """Insert rows with multi-row VALUES statements, each carrying as many rows as the bind limit allows."""
+    columns = ', '.join(f'"{key}"' for key in keys)
+    row_placeholder = f"({', '.join(['%s'] * len(keys))})"
+    page_size = max(1, MAX_BIND_PARAMS // len(keys))
+    for start in range(0, len(rows), page_size):
+        page = rows[start:start + page_size]
+        cur.execute(
+            f"INSERT INTO {table_name} ({columns}) VALUES {', '.join([row_placeholder] * len(page))}",
+            [value for row in page for value in row]
+        )
+
+def psql_insert_values(table, conn, keys: List[str], data_iter: Iterable) -> None:
+    """pandas to_sql insertion method for small frames, where COPY setup outweighs its gain."""
+    with conn.connection.cursor() as cur:
+        _bulk_insert_values(cur, _qualified_name(table), keys, list(data_iter))
+
+def psql_insert_copy(table, conn, keys: List[str], data_iter: Iterable) -> None:
+    """pandas to_sql insertion method that bulk loads rows with COPY FROM STDIN."""
+    csv_buffer = StringIO()
+    csv.writer(csv_buffer).writerows(data_iter)
+
+    columns = ', '.join(f'"{key}"' for key in keys)
+    table_name = _qualified_name(table)
+    with conn.connection.cursor() as cur:
+        with cur.copy(f'COPY {table_name} ({columns}) FROM STDIN WITH CSV') as copy:
+            copy.write(csv_buffer.getvalue())
 
 class PostgresClient:
     """Client for PostgreSQL database operations."""
 
     def __init__(self, connection_string: str):
         """Initialize PostgreSQL client."""
-        # Parse connection string
-        result = urlparse(connection_string)
-        self.db_params = {
-            'dbname': result.path[1:],
-            'user': result.username,
-            'password': result.password,
-            'host': result.hostname,
-            'port': result.port or 5432
-        }
-        
-        # Test connection with psycopg2 first
-        try:
-            conn = psycopg2.connect(**self.db_params)
-            conn.close()
-        except Exception as e:
-            raise Exception(f"Failed to connect to database: {str(e)}")
-            
-        # Create SQLAlchemy engine if psycopg2 connection succeeds
-        self.engine = create_engine(
-            connection_string,
-            pool_pre_ping=True,
-            pool_recycle=3600,
-            pool_size=5
-        )
+        # Reuse the shared engine; SQLAlchemy invalidates the pool if a connection drops
+        self.engine = _get_engine(connection_string)
         self.schema = 'medate_exam'  # Set default schema
+        self._connection_string = connection_string
+        self._closed = False
+
+    def close(self) -> None:
+        """Close the client, disposing the shared engine if no other client with the same DSN is open."""
+        if self._closed:
+            return
+        self._closed = True
+        _release_engine(self._connection_string)
+
+    def __enter__(self) -> 'PostgresClient':
+        """Use the client as a context manager that closes it on exit."""
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        """Close the client when leaving the context."""
+        self.close()
 
     def get_table_schema(self, table_name: str, schema: str = 'medate_exam') -> List[Dict[str, Any]]:
         """Get schema information for a table."""
-        query = text(f"""
-            SELECT column_name, data_type, is_nullable
-            FROM information_schema.columns
-            WHERE table_schema = :schema
-            AND table_name = :table
-            ORDER BY ordinal_position
-        """)
-        
-        with self.engine.connect() as conn:
-            result = conn.execute(query, {'schema': schema, 'table': table_name})
-            return [dict(row) for row in result]
-
-    def write_dataframe(self, df: pd.DataFrame, table_name: str, if_exists: str = 'append', schema: str = None) -> None:
-        """Write a DataFrame to a table."""
+        # Copy the cached rows so callers cannot mutate the shared cache
+        return [dict(column) for column in _cached_table_schema(self.engine, schema, table_name)]
+
+    def write_dataframe(self, df: pd.DataFrame, table_name: str, if_exists: str = 'append', schema: str = None,
+                        chunksize: int = 10_000) -> None:
+        """Write a DataFrame to a table in chunks of at most ``chunksize`` rows to bound memory."""
         schema = schema or self.schema
+        # COPY is only available on PostgreSQL; other dialects use the default INSERT path
+        if self.engine.dialect.name != 'postgresql':
+            method = None
+        elif len(df) < COPY_MIN_ROWS or self.engine.dialect.driver != 'psycopg':
+            # psql_insert_copy uses psycopg3's cursor.copy(), which other drivers do not offer
+            method = psql_insert_values
+        else:
+            method = psql_insert_copy
         with self.engine.begin() as conn:
-            df.to_sql(table_name, conn, schema=schema, if_exists=if_exists, index=False)
+            df.to_sql(table_name, conn, schema=schema, if_exists=if_exists, index=False,
+                      method=method, chunksize=chunksize)
+
+    @contextmanager
+    def connection(self) -> Iterator[Connection]:
+        """Share a single pooled connection across the client's read calls within the block."""
+        with _connect(self.engine) as conn:
+            token = _ACTIVE_CONNECTION.set(conn)
+            try:
+                yield conn
+            finally:
+                _ACTIVE_CONNECTION.reset(token)
 
     @contextmanager
     def transaction(self):
@@ -74,36 +210,42 @@ class PostgresClient:
         finally:
             conn.close()
 
-    def read_table(self, table_name: str) -> pd.DataFrame:
-        """Read a table into a DataFrame."""
-        query = f"SELECT * FROM {self.schema}.{table_name}"
-        with self.engine.connect() as conn:
-            return pd.read_sql(query, conn)
+    def read_table(self, table_name: str, chunksize: Optional[int] = None) -> Union[pd.DataFrame, Iterator[pd.DataFrame]]:
+        """Read a table into a DataFrame, or an iterator of DataFrames when ``chunksize`` is set."""
+        # Server-side cursor so rows are fetched in batches rather than all at once
+        query = text(f"SELECT * FROM {self.schema}.{table_name}").execution_options(
+            stream_results=True,
+            yield_per=10_000
+        )
+        if chunksize is not None:
+            return self._read_chunks(query, chunksize)
+        with _connect(self.engine) as conn:
+            return pd.read_sql_query(query, conn)
+
+    def _read_chunks(self, query, chunksize: int) -> Iterator[pd.DataFrame]:
+        """Yield query results in DataFrame chunks, holding the connection until exhausted."""
+        with _connect(self.engine) as conn:
+            yield from pd.read_sql_query(query, conn, chunksize=chunksize)
+
+    def read_query(self, query: Union[str, TextClause], params: Dict[str, Any] = None) -> pd.DataFrame:
+        """Run a SELECT and return its rows as a DataFrame, letting the database do the filtering."""
+        with _connect(self.engine) as conn:
+            return pd.read_sql_query(_as_text(query), conn, params=params or {})
 
-    def execute_query(self, query: str, params: Dict[str, Any] = None) -> List[Dict[str, Any]]:
-        """Execute a SQL query and return results."""
-        with self.engine.connect() as conn:
-            result = conn.execute(text(query), params or {})
+    def execute_query(self, query: Union[str, TextClause], params: Dict[str, Any] = None) -> List[Mapping[str, Any]]:
+        """Execute a SQL query and return results as dict-like row mappings."""
+        with _connect(self.engine) as conn:
+            result = conn.execute(_as_text(query), params or {})
             if result.returns_rows:
-                columns = result.keys()
-                return [dict(zip(columns, row)) for row in result]
+                return result.mappings().all()
             return []
 
     def table_exists(self, table_name: str, schema: str = 'medical') -> bool:
         """Check if a table exists."""
-        query = text("""
-            SELECT EXISTS (
-                SELECT FROM information_schema.tables 
-                WHERE table_schema = :schema
-                AND table_name = :table
-            )
-        """)
-        
-        with self.engine.connect() as conn:
-            result = conn.execute(query, {'schema': schema, 'table': table_name})
-            return result.scalar()
-
-    def __del__(self):
-        """Ensure engine is properly disposed when client is deleted."""
-        if hasattr(self, 'engine'):
-            self.engine.dispose() 
\ No newline at end of file
+        return _cached_table_exists(self.engine, schema, table_name)
+
+    @classmethod
+    def clear_schema_cache(cls) -> None:
+        """Forget cached schema lookups, e.g. after DDL changes."""
+        _cached_table_schema.cache_clear()
+        _cached_table_exists.cache_clear()
\ No newline at end of file
@@ -0,0 +1,10 @@
+"""
+Central logging configuration for the application.
+"""
+import logging
+
+LOG_FORMAT = "%(asctime)s %(levelname)s %(name)s: %(message)s"
+
+def configure_logging(level: int = logging.INFO) -> None:
+    """Configure the root logger once for the whole process; later calls are no-ops."""
+    logging.basicConfig(level=level, format=LOG_FORMAT)
\ No newline at end of file
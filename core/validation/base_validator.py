@@ -6,8 +6,15 @@ from typing import Any, List, Union, Type, Optional
 import pandas as pd
 
 class ValidationError(Exception):
-    """Custom validation error."""
-    pass
+    """Custom validation error whose message is %-formatted only when rendered."""
+
+    def __init__(self, message: str, *args: Any):
+        super().__init__(message, *args)
+        self.message = message
+        self.format_args = args
+
+    def __str__(self) -> str:
+        return self.message % self.format_args if self.format_args else self.message
 
 class BaseValidator:
     """Base validator class for test assertions."""
@@ -16,22 +23,20 @@ class BaseValidator:
         """Validate that two values are equal."""
         if actual != expected:
             raise ValidationError(
-                f"Value mismatch for {field_name}: Expected '{expected}', got '{actual}'"
+                "Value mismatch for %s: Expected '%s', got '%s'", field_name, expected, actual
             )
     
     def validate_required_fields(self, data: dict, required_fields: List[str]) -> None:
         """Validate that all required fields are present in the data."""
-        missing_fields = [field for field in required_fields if field not in data]
+        missing_fields = set(required_fields).difference(data)
         if missing_fields:
-            raise ValidationError(
-                f"Missing required fields: {', '.join(missing_fields)}"
-            )
+            raise ValidationError("Missing required fields: %s", ', '.join(sorted(missing_fields)))
     
     def validate_pattern(self, actual: str, expected_pattern: str, field_name: str) -> None:
         """Validate that a string matches an expected pattern."""
         if actual != expected_pattern:
             raise ValidationError(
-                f"Pattern mismatch for {field_name}: Expected '{expected_pattern}', got '{actual}'"
+                "Pattern mismatch for %s: Expected '%s', got '%s'", field_name, expected_pattern, actual
             )
     
     def validate_range(
@@ -44,15 +49,32 @@ class BaseValidator:
         """Validate that a value is within an expected range."""
         if not min_value <= value <= max_value:
             raise ValidationError(
-                f"Value out of range for {field_name}: "
-                f"Expected between {min_value} and {max_value}, got {value}"
+                "Value out of range for %s: Expected between %s and %s, got %s",
+                field_name, min_value, max_value, value
+            )
+    
+    def validate_date_range_series(
+        self,
+        series: pd.Series,
+        from_date: Union[str, datetime],
+        to_date: Union[str, datetime],
+        field_name: str
+    ) -> None:
+        """Validate that every ISO formatted date in a series is within an expected range."""
+        dates = pd.to_datetime(series, format='%Y-%m-%d')
+        out_of_range = dates[(dates < pd.Timestamp(from_date)) | (dates > pd.Timestamp(to_date))]
+        if not out_of_range.empty:
+            raise ValidationError(
+                "Value out of range for %s: Expected between %s and %s, got %s",
+                field_name, from_date, to_date, ', '.join(out_of_range.dt.strftime('%Y-%m-%d'))
             )
     
     def validate_type(self, value: Any, expected_type: Type, field_name: str) -> None:
         """Validate that a value is of the expected type."""
         if not isinstance(value, expected_type):
             raise ValidationError(
-                f"Invalid type for {field_name}: Expected {expected_type.__name__}, got {type(value).__name__}"
+                "Invalid type for %s: Expected %s, got %s",
+                field_name, expected_type.__name__, type(value).__name__
             )
             
     def validate_dataframe_equality(
@@ -73,50 +95,73 @@ class BaseValidator:
             sort_by: Optional list of columns to sort by before comparing
             check_dtype: Whether to check data types of columns
             description: Optional description for context in error messages
+
+        Values are compared exactly, and both frames must list their columns in the same order.
         """
-        context = f" for {description}" if description else ""
-        
-        # Sort DataFrames if sort_by is provided, otherwise use all columns
-        sort_columns = sort_by if sort_by is not None else list(actual_df.columns)
+        # Sort only when keys are given and the row counts match; skip frames already in key order
+        if sort_by is not None and len(actual_df) == len(expected_df):
+            actual_df = self._sorted_by(actual_df, sort_by)
+            expected_df = self._sorted_by(expected_df, sort_by)
+        if ignore_index:
+            actual_df = actual_df.reset_index(drop=True)
+            expected_df = expected_df.reset_index(drop=True)
         
-        # Sort both DataFrames
-        actual_df = actual_df.sort_values(by=sort_columns).reset_index(drop=True)
-        expected_df = expected_df.sort_values(by=sort_columns).reset_index(drop=True)
-        
-        # Check data types if required
+        # Check data types if required, comparing the dtype arrays in one pass
         if check_dtype:
-            actual_dtypes = actual_df.dtypes.to_dict()
-            expected_dtypes = expected_df.dtypes.to_dict()
-            if actual_dtypes != expected_dtypes:
+            actual_dtypes = actual_df.dtypes
+            expected_dtypes = expected_df.dtypes.reindex(actual_dtypes.index)
+            if not (actual_dtypes.values == expected_dtypes.values).all():
                 differences = []
-                for col in actual_dtypes:
-                    if col in expected_dtypes and actual_dtypes[col] != expected_dtypes[col]:
+                for col in actual_dtypes.index:
+                    if col in expected_df.columns and actual_dtypes[col] != expected_dtypes[col]:
                         differences.append(
                             f"Column '{col}' has mismatched types: "
                             f"Expected {expected_dtypes[col]}, got {actual_dtypes[col]}"
                         )
                 raise ValidationError(
-                    f"DataFrame dtypes are not equal{context}. Differences found: {', '.join(differences)}"
+                    "DataFrame dtypes are not equal%s. Differences found: %s",
+                    f" for {description}" if description else "", ', '.join(differences)
                 )
         
-        # Check if DataFrames are equal
-        if not actual_df.equals(expected_df):
-            # Find differences
+        # Compare all column blocks at once; only diff column by column on failure
+        try:
+            pd.testing.assert_frame_equal(
+                actual_df,
+                expected_df,
+                check_dtype=check_dtype,
+                check_exact=True
+            )
+        except AssertionError:
             differences = []
+            if list(actual_df.columns) != list(expected_df.columns):
+                differences.append(
+                    f"Column order differs: Expected {list(expected_df.columns)}, got {list(actual_df.columns)}"
+                )
             for col in actual_df.columns:
-                if not actual_df[col].equals(expected_df[col]):
+                if col not in expected_df.columns or not actual_df[col].equals(expected_df[col]):
                     differences.append(f"Column '{col}' has mismatched values")
             
             raise ValidationError(
-                f"DataFrames are not equal{context}. Differences found: {', '.join(differences)}"
+                "DataFrames are not equal%s. Differences found: %s",
+                f" for {description}" if description else "", ', '.join(differences)
             )
             
+    @staticmethod
+    def _sorted_by(df: pd.DataFrame, sort_by: Union[str, List[str]]) -> pd.DataFrame:
+        """Sort a DataFrame by the given keys unless it is already in that order."""
+        keys = [sort_by] if isinstance(sort_by, str) else list(sort_by)
+        if len(keys) == 1:
+            already_sorted = df[keys[0]].is_monotonic_increasing
+        else:
+            already_sorted = pd.MultiIndex.from_frame(df[keys]).is_monotonic_increasing
+        return df if already_sorted else df.sort_values(by=keys)
+            
     def validate_record_count(self, actual_count: int, expected_count: int, context: str = "") -> None:
         """Validate that the actual record count matches the expected count."""
         if actual_count != expected_count:
             raise ValidationError(
-                f"Record count mismatch{' for ' + context if context else ''}: "
-                f"Expected {expected_count}, got {actual_count}"
+                "Record count mismatch%s: Expected %s, got %s",
+                f" for {context}" if context else "", expected_count, actual_count
             )
             
     def validate_record_exists(
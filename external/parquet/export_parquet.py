@@ -1,12 +1,15 @@
-import pandas as pd
+import io
 import pyarrow as pa
+import pyarrow.csv as pv
 import pyarrow.parquet as pq
 import boto3
-from sqlalchemy import create_engine
+from boto3.s3.transfer import TransferConfig
+from concurrent.futures import ThreadPoolExecutor
+from sqlalchemy import create_engine, text
 
 # 1) Point at your Postgres instance and schema
 # import os
-# from sqlalchemy import create_engine
+# from sqlalchemy import create_engine, text
 
 user = 'postgres'
 pw   = 'P7088990p!Postgres'
@@ -22,17 +25,83 @@ s3 = boto3.client('s3')
 bucket = 'external-medate-exam-data'
 prefix = 'parquet'
 
-# 3) Export each table to Parquet and upload
-for table in ['admissions', 'lab_results', 'lab_tests', 'patient_information']:
-    # Read from the 'medate_exam' schema
-    df = pd.read_sql_table(table, engine, schema='medate_exam')
+# Multipart uploads in 8 MB parts, several parts in flight per file
+transfer_config = TransferConfig(multipart_chunksize=8 * 1024 * 1024, max_concurrency=8)
+
+tables = ['admissions', 'lab_results', 'lab_tests', 'patient_information']
+
+# Arrow types for the Postgres column types, matching what the pandas export produced
+pg_to_arrow = {
+    'character varying': pa.string(),
+    'text': pa.string(),
+    'integer': pa.int64(),
+    'bigint': pa.int64(),
+    'smallint': pa.int64(),
+    'numeric': pa.float64(),
+    'real': pa.float64(),
+    'double precision': pa.float64(),
+    'boolean': pa.bool_(),
+    'date': pa.timestamp('ns'),
+    'timestamp without time zone': pa.timestamp('ns'),
+    'time without time zone': pa.time64('us'),
+}
+
+def read_table_arrow(table):
+    # Look up column types so the CSV is parsed straight into typed Arrow columns
+    with engine.connect() as conn:
+        columns = conn.execute(text("""
+            SELECT column_name, data_type
+            FROM information_schema.columns
+            WHERE table_schema = 'medate_exam' AND table_name = :table
+        """), {'table': table}).fetchall()
+    column_types = {name: pg_to_arrow.get(data_type, pa.string()) for name, data_type in columns}
 
-    # Convert to a PyArrow table and write to a Parquet file locally
-    table_pa = pa.Table.from_pandas(df)
+    # Stream the table out of Postgres with COPY, skipping the pandas DataFrame entirely
+    buffer = io.BytesIO()
+    raw_conn = engine.raw_connection()
+    try:
+        with raw_conn.cursor() as cur:
+            cur.copy_expert(f'COPY medate_exam.{table} TO STDOUT WITH CSV HEADER', buffer)
+    finally:
+        raw_conn.close()
+    buffer.seek(0)
+    return parse_copy_csv(buffer, column_types)
+
+def parse_copy_csv(buffer, column_types):
+    # COPY writes NULL as an unquoted empty field and empty strings as "";
+    # only that empty field is NULL, so values such as N/A, NA or null stay strings
+    convert_options = pv.ConvertOptions(
+        column_types=column_types,
+        null_values=[''],
+        true_values=['t'],
+        false_values=['f'],
+        strings_can_be_null=True,
+        quoted_strings_can_be_null=False
+    )
+    return pv.read_csv(buffer, convert_options=convert_options)
+
+# 3) Export each table to Parquet and upload
+def export_one(table):
+    # Read from the 'medate_exam' schema and write to a Parquet file locally
+    table_pa = read_table_arrow(table)
     local_path = f'{table}.parquet'
-    pq.write_table(table_pa, local_path)
+    # ZSTD gives smaller files than the default Snappy at similar speed, so uploads are shorter
+    pq.write_table(
+        table_pa,
+        local_path,
+        compression='zstd',
+        compression_level=3,
+        use_dictionary=True,
+        data_page_size=1 << 20
+    )
 
     # Upload that file into S3 under parquet/<table>/<table>.parquet
     s3_key = f'{prefix}/{table}/{table}.parquet'
     print(f'Uploading {local_path} to s3://{bucket}/{s3_key}')
-    s3.upload_file(local_path, bucket, s3_key)
+    with open(local_path, 'rb') as f:
+        s3.upload_fileobj(f, bucket, s3_key, Config=transfer_config)
+
+# Postgres reads and S3 uploads are I/O bound, so export the tables concurrently
+if __name__ == '__main__':
+    with ThreadPoolExecutor(max_workers=len(tables)) as executor:
+        list(executor.map(export_one, tables))
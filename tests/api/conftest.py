@@ -2,10 +2,10 @@
 Pytest configuration and fixtures for API testing.
 """
 import pytest
-from unittest.mock import MagicMock
 from fastapi.testclient import TestClient
 from core.api.app import app
 from core.api.dependencies.database import get_db
+from tests.api.fakes import FakeDB
 
 @pytest.fixture(scope="session")
 def client() -> TestClient:
@@ -17,19 +17,18 @@ def client() -> TestClient:
 @pytest.fixture
 def mock_db():
     """Create a mock database session."""
-    mock_session = MagicMock()
-    return mock_session
+    return FakeDB()
 
 @pytest.fixture
-def client_with_mocked_db(mock_db):
-    """Create a test client with mocked database."""
-    # Create a fresh test client for each test
-    test_client = TestClient(app)
+def client_with_mocked_db(client, mock_db):
+    """Share the session test client with the database dependency mocked."""
+    app.state.patient_cache.clear()
     
     # Override the database dependency
     app.dependency_overrides[get_db] = lambda: mock_db
     
-    yield test_client
-    
-    # Clean up after test
-    app.dependency_overrides = {}
+    try:
+        yield client
+    finally:
+        # Clean up after test
+        app.dependency_overrides.pop(get_db, None)
\ No newline at end of file
@@ -0,0 +1,35 @@
+"""
+Lightweight database stubs for API tests.
+"""
+
+class FakeResult:
+    """Lightweight stand-in for a SQLAlchemy result."""
+
+    def __init__(self, rows=None):
+        """Store the rows to return."""
+        self._rows = rows or []
+
+    def mappings(self):
+        """Return the result itself, mirroring Result.mappings()."""
+        return self
+
+    def first(self):
+        """Return the first row or None."""
+        return self._rows[0] if self._rows else None
+
+    def all(self):
+        """Return all rows."""
+        return self._rows
+
+class FakeDB:
+    """Lightweight stand-in for an async database session returning a preset result."""
+
+    def __init__(self):
+        """Start with an empty result and no recorded queries."""
+        self.result = FakeResult()
+        self.execute_count = 0
+
+    async def execute(self, query, params=None):
+        """Record the call and return the preset result."""
+        self.execute_count += 1
+        return self.result
\ No newline at end of file
@@ -2,22 +2,96 @@
 Global test configuration and fixtures.
 """
 import os
+from io import BytesIO
 import boto3
 import pytest
 import pandas as pd
 import pyarrow as pa
 import pyarrow.parquet as pq
-from sqlalchemy import create_engine, text
-from typing import Generator, Dict, Any
-from datetime import datetime, timezone, UTC
+from sqlalchemy import column, table, text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+from typing import Generator, Dict, Any, List
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import date, datetime, time, timezone, UTC
 from core.db.postgres_client import PostgresClient
 from core.aws.aws_client import AWSClient
-from config.config import config
+from core.validation.base_validator import BaseValidator
+from config.config import get_config
+from tests.db_helpers import delete_rows_by_id, delete_test_rows
+
+config = get_config()
+
+# Primary key prefixes used by rows the tests create
+TEST_PREFIXES = ('TEST', 'SCHEMA', 'CRUD', 'REFL')
+
+# Arrow schemas for the fixture tables, so uploads skip pandas type inference
+_STRING, _DATE, _TIME = pa.string(), pa.date32(), pa.time64('us')
+ARROW_SCHEMAS = {
+    'patient_information': pa.schema([
+        ('patient_id', _STRING), ('first_name', _STRING), ('last_name', _STRING),
+        ('date_of_birth', _DATE), ('primary_physician', _STRING),
+        ('insurance_provider', _STRING), ('blood_type', _STRING), ('allergies', _STRING)
+    ]),
+    'lab_tests': pa.schema([
+        ('test_id', _STRING), ('patient_id', _STRING), ('test_name', _STRING),
+        ('order_date', _DATE), ('order_time', _TIME), ('ordering_physician', _STRING)
+    ]),
+    'lab_results': pa.schema([
+        ('result_id', _STRING), ('test_id', _STRING), ('result_value', pa.float64()),
+        ('result_unit', _STRING), ('reference_range', _STRING), ('result_status', _STRING),
+        ('performed_date', _DATE), ('performed_time', _TIME), ('reviewing_physician', _STRING)
+    ]),
+    'admissions': pa.schema([
+        ('hospitalization_case_number', _STRING), ('patient_id', _STRING),
+        ('admission_date', _DATE), ('admission_time', _TIME),
+        ('release_date', _DATE), ('release_time', _TIME),
+        ('department', _STRING), ('room_number', _STRING)
+    ])
+}
+
+# Catalog query for the column types of every table in a schema
+_PG_SCHEMAS_QUERY = text("""
+    SELECT table_name, column_name, data_type
+    FROM information_schema.columns
+    WHERE table_schema = :schema
+    ORDER BY table_name, ordinal_position
+""")
+
+# Foreign keys of a schema's tables, with definitions as pg_get_constraintdef prints them
+_FOREIGN_KEYS_QUERY = text("""
+    SELECT cl.relname, con.conname, pg_get_constraintdef(con.oid)
+    FROM pg_constraint con
+    JOIN pg_class cl ON cl.oid = con.conrelid
+    JOIN pg_namespace ns ON ns.oid = cl.relnamespace
+    WHERE ns.nspname = :schema AND con.contype = 'f'
+""")
+
+# Fixture tables hold a handful of rows, so compression, dictionaries and
+# column statistics cost more CPU than the bytes they would save
+FIXTURE_PARQUET_OPTIONS = {
+    'compression': 'none',
+    'use_dictionary': False,
+    'write_statistics': False
+}
+
+def bulk_insert(conn, table_name: str, df: pd.DataFrame, schema: str = 'medate_exam') -> None:
+    """Insert all rows of a DataFrame in a single multi-row INSERT, skipping existing keys."""
+    if df.empty:
+        return
+    target = table(table_name, *(column(name) for name in df.columns), schema=schema)
+    conn.execute(
+        pg_insert(target)
+        .values(df.to_dict(orient='records'))
+        .on_conflict_do_nothing(index_elements=[config.table_pk_map[table_name]])
+    )
 
 @pytest.fixture(scope="session")
-def postgres_client() -> PostgresClient:
+def postgres_client() -> Generator[PostgresClient, None, None]:
     """Create a PostgreSQL client for testing."""
-    return PostgresClient(config.postgres_url)
+    # Closing the last client with this DSN disposes the shared engine's pooled connections
+    with PostgresClient(config.postgres_url) as client:
+        yield client
 
 @pytest.fixture(scope="session")
 def aws_client() -> AWSClient:
@@ -25,13 +99,72 @@ def aws_client() -> AWSClient:
     return AWSClient()
 
 @pytest.fixture(scope="session")
-def pg_engine():
-    """Create database engine."""
-    engine = create_engine(config.postgres_url)
-    yield engine
-    engine.dispose()
+def validator() -> BaseValidator:
+    """Create the validator shared by every test in the session."""
+    return BaseValidator()
 
-@pytest.fixture(scope="function")
+@pytest.fixture(scope="session")
+def pg_engine(postgres_client: PostgresClient):
+    """Share the PostgreSQL client's engine so the session keeps a single warm connection pool."""
+    return postgres_client.engine
+
+@pytest.fixture(scope="session")
+def db_schema(pg_engine) -> Generator[str, None, None]:
+    """Schema that the data validation tests and their fixtures read and write.
+
+    Under pytest-xdist every worker gets a private copy of medate_exam
+    (without rows created by other test sessions), so parallel workers never
+    contend on, sweep or observe each other's rows. The copy carries the same
+    foreign keys, so parent/child constraints are enforced either way.
+    Without xdist the shared schema is used as is.
+    """
+    worker = os.environ.get('PYTEST_XDIST_WORKER')
+    if worker is None:
+        yield 'medate_exam'
+        return
+
+    schema = f"medate_exam_{worker}"
+    patterns = [f"{prefix}%" for prefix in TEST_PREFIXES]
+    with pg_engine.begin() as conn:
+        conn.execute(text(f"DROP SCHEMA IF EXISTS {schema} CASCADE"))
+        conn.execute(text(f"CREATE SCHEMA {schema}"))
+        for table_name, pk_col in config.table_pk_map.items():
+            conn.execute(text(f"CREATE TABLE {schema}.{table_name} (LIKE medate_exam.{table_name} INCLUDING ALL)"))
+            conn.execute(
+                text(f"""
+                    INSERT INTO {schema}.{table_name}
+                    SELECT * FROM medate_exam.{table_name}
+                    WHERE NOT ({pk_col} LIKE ANY(:patterns))
+                """),
+                {'patterns': patterns}
+            )
+        # LIKE ... INCLUDING ALL does not copy foreign keys, so recreate them against the
+        # worker's tables; NOT VALID skips orphans left by other workers' fixture rows
+        # while still enforcing the constraints on every row the tests write
+        conn.execute(text("SET LOCAL search_path TO pg_catalog"))
+        foreign_keys = conn.execute(_FOREIGN_KEYS_QUERY, {'schema': 'medate_exam'}).all()
+        for table_name, constraint_name, definition in foreign_keys:
+            definition = definition.replace('REFERENCES medate_exam.', f'REFERENCES {schema}.')
+            conn.execute(text(
+                f"ALTER TABLE {schema}.{table_name} ADD CONSTRAINT {constraint_name} {definition} NOT VALID"
+            ))
+    try:
+        yield schema
+    finally:
+        with pg_engine.begin() as conn:
+            conn.execute(text(f"DROP SCHEMA IF EXISTS {schema} CASCADE"))
+
+@pytest.fixture(scope="session")
+def pg_schemas(pg_engine, db_schema: str) -> Dict[str, Dict[str, str]]:
+    """Column types of every table in the test schema, fetched with a single catalog query."""
+    schemas: Dict[str, Dict[str, str]] = {}
+    with pg_engine.connect() as conn:
+        result = conn.execute(_PG_SCHEMAS_QUERY, {'schema': db_schema})
+        for table_name, column_name, data_type in result:
+            schemas.setdefault(table_name, {})[column_name] = data_type
+    return schemas
+
+@pytest.fixture(scope="session")
 def test_data() -> Dict[str, pd.DataFrame]:
     """Create test data for all tables."""
     # Sample patient data
@@ -39,7 +172,7 @@ def test_data() -> Dict[str, pd.DataFrame]:
         'patient_id': ['TEST001', 'TEST002', 'CRUD_PAT001'],
         'first_name': ['John', 'Jane', 'Bob'],
         'last_name': ['Doe', 'Smith', 'Johnson'],
-        'date_of_birth': pd.Series(['1990-01-01', '1992-02-02', '1985-03-03']).apply(pd.to_datetime).dt.date,
+        'date_of_birth': [date(1990, 1, 1), date(1992, 2, 2), date(1985, 3, 3)],
         'primary_physician': ['Dr. House', 'Dr. Wilson', 'Dr. Smith'],
         'insurance_provider': ['Medicare', 'BlueCross', 'Aetna'],
         'blood_type': ['A+', 'O-', 'B+'],
@@ -51,8 +184,8 @@ def test_data() -> Dict[str, pd.DataFrame]:
         'test_id': ['TST001', 'TST002', 'TST003', 'CRUD_TST001'],
         'patient_id': ['TEST001', 'TEST002', 'TEST001', 'CRUD_PAT001'],
         'test_name': ['Blood Test', 'X-Ray', 'MRI', 'Blood Test'],
-        'order_date': pd.Series(['2024-03-14', '2024-03-14', '2024-03-14', '2024-03-14']).apply(pd.to_datetime).dt.date,
-        'order_time': pd.Series(['10:00:00', '11:00:00', '12:00:00', '13:00:00']).apply(pd.to_datetime).dt.time,
+        'order_date': [date(2024, 3, 14), date(2024, 3, 14), date(2024, 3, 14), date(2024, 3, 14)],
+        'order_time': [time(10, 0), time(11, 0), time(12, 0), time(13, 0)],
         'ordering_physician': ['Dr. House', 'Dr. Wilson', 'Dr. House', 'Dr. Smith']
     })
 
@@ -64,8 +197,8 @@ def test_data() -> Dict[str, pd.DataFrame]:
         'result_unit': ['mg/dL', None, 'mg/dL'],
         'reference_range': ['70-100', None, '70-100'],
         'result_status': ['Final', 'Preliminary', 'Final'],
-        'performed_date': pd.Series(['2024-03-14', '2024-03-14', '2024-03-14']).apply(pd.to_datetime).dt.date,
-        'performed_time': pd.Series(['12:00:00', '13:00:00', '14:00:00']).apply(pd.to_datetime).dt.time,
+        'performed_date': [date(2024, 3, 14), date(2024, 3, 14), date(2024, 3, 14)],
+        'performed_time': [time(12, 0), time(13, 0), time(14, 0)],
         'reviewing_physician': ['Lab Tech 1', 'Lab Tech 2', 'Lab Tech 3']
     })
 
@@ -73,10 +206,10 @@ def test_data() -> Dict[str, pd.DataFrame]:
     admissions_data = pd.DataFrame({
         'hospitalization_case_number': ['TEST001', 'TEST002', 'TEST003'],
         'patient_id': ['TEST001', 'TEST002', 'TEST001'],
-        'admission_date': pd.Series(['2024-03-14', '2024-03-14', '2024-03-14']).apply(pd.to_datetime).dt.date,
-        'admission_time': pd.Series(['09:00:00', '10:00:00', '11:00:00']).apply(pd.to_datetime).dt.time,
-        'release_date': pd.Series(['2024-03-15', None, '2024-03-16']).apply(lambda x: pd.to_datetime(x).date() if pd.notna(x) else None),
-        'release_time': pd.Series(['09:00:00', None, '10:00:00']).apply(lambda x: pd.to_datetime(x).time() if pd.notna(x) else None),
+        'admission_date': [date(2024, 3, 14), date(2024, 3, 14), date(2024, 3, 14)],
+        'admission_time': [time(9, 0), time(10, 0), time(11, 0)],
+        'release_date': [date(2024, 3, 15), None, date(2024, 3, 16)],
+        'release_time': [time(9, 0), None, time(10, 0)],
         'department': ['Emergency', 'Outpatient', 'Emergency'],
         'room_number': ['E101', 'O202', 'E103']
     })
@@ -88,102 +221,60 @@ def test_data() -> Dict[str, pd.DataFrame]:
         'admissions': admissions_data
     }
 
-@pytest.fixture(scope="function")
-def setup_test_data(postgres_client: PostgresClient, aws_client: AWSClient, 
-                   test_data: Dict[str, pd.DataFrame]) -> Generator:
-    """Set up test data in both PostgreSQL and S3."""
-    # Clean up any existing test data first in reverse order
-    cleanup_order = ['lab_results', 'lab_tests', 'admissions', 'patient_information']
+@pytest.fixture(scope="session")
+def clean_test_rows(postgres_client: PostgresClient, db_schema: str) -> None:
+    """Sweep test-prefixed rows left behind by earlier runs once, before the session starts."""
     with postgres_client.transaction() as conn:
-        # First, delete all test data in reverse order to respect foreign keys
-        for table_name in cleanup_order:
-            conn.execute(text(f"""
-                DELETE FROM medate_exam.{table_name}
-                WHERE {config.table_pk_map[table_name]} LIKE 'TEST%' OR {config.table_pk_map[table_name]} LIKE 'SCHEMA%' OR {config.table_pk_map[table_name]} LIKE 'CRUD%' OR {config.table_pk_map[table_name]} LIKE 'REFL%'
-            """))
+        delete_test_rows(conn, TEST_PREFIXES, db_schema)
         conn.commit()
 
+@pytest.fixture(scope="session")
+def setup_test_data(postgres_client: PostgresClient, aws_client: AWSClient, 
+                   test_data: Dict[str, pd.DataFrame], db_schema: str, clean_test_rows) -> Generator:
+    """Set up test data in both PostgreSQL and S3."""
     timestamp = datetime.now(UTC).strftime("%Y%m%dT%H%M%S")
-    s3_paths = {}
+    table_order = ['patient_information', 'lab_tests', 'lab_results', 'admissions']
+    s3_paths = {
+        table_name: f"raw/parquet/{table_name}/{table_name}_{timestamp}.parquet"
+        for table_name in table_order
+    }
+    s3 = aws_client.s3
+
+    def upload_table(table_name):
+        table = pa.Table.from_pandas(test_data[table_name], schema=ARROW_SCHEMAS[table_name], preserve_index=False)
+        # Write straight into a file-like buffer so boto3 streams it without an extra bytes copy
+        parquet_buffer = BytesIO()
+        pq.write_table(table, parquet_buffer, **FIXTURE_PARQUET_OPTIONS)
+        parquet_buffer.seek(0)
+        s3.put_object(
+            Bucket=config.s3_bucket,
+            Key=s3_paths[table_name],
+            Body=parquet_buffer
+        )
 
     try:
-        # Load data into PostgreSQL in the correct order
-        table_order = ['patient_information', 'lab_tests', 'lab_results', 'admissions']
-        
-        # First, insert all patient records
-        with postgres_client.transaction() as conn:
-            df = test_data['patient_information']
-            for _, row in df.iterrows():
-                conn.execute(text("""
-                    INSERT INTO medate_exam.patient_information
-                    (patient_id, first_name, last_name, date_of_birth, primary_physician, insurance_provider, blood_type, allergies)
-                    VALUES (:patient_id, :first_name, :last_name, :date_of_birth, :primary_physician, :insurance_provider, :blood_type, :allergies)
-                    ON CONFLICT (patient_id) DO NOTHING
-                """), row.to_dict())
-            conn.commit()
-            
-        # Then insert lab tests
-        with postgres_client.transaction() as conn:
-            df = test_data['lab_tests']
-            for _, row in df.iterrows():
-                result = conn.execute(text("""
-                    SELECT patient_id FROM medate_exam.patient_information WHERE patient_id = :patient_id
-                """), {'patient_id': row['patient_id']})
-                if result.scalar() is not None:
-                    conn.execute(text("""
-                        INSERT INTO medate_exam.lab_tests
-                        (test_id, patient_id, test_name, order_date, order_time, ordering_physician)
-                        VALUES (:test_id, :patient_id, :test_name, :order_date, :order_time, :ordering_physician)
-                        ON CONFLICT (test_id) DO NOTHING
-                    """), row.to_dict())
-            conn.commit()
-            
-        # Then insert lab results
-        with postgres_client.transaction() as conn:
-            df = test_data['lab_results']
-            for _, row in df.iterrows():
-                result = conn.execute(text("""
-                    SELECT test_id FROM medate_exam.lab_tests WHERE test_id = :test_id
-                """), {'test_id': row['test_id']})
-                if result.scalar() is not None:
-                    conn.execute(text("""
-                        INSERT INTO medate_exam.lab_results
-                        (result_id, test_id, result_value, result_unit, reference_range, result_status, performed_date, performed_time, reviewing_physician)
-                        VALUES (:result_id, :test_id, :result_value, :result_unit, :reference_range, :result_status, :performed_date, :performed_time, :reviewing_physician)
-                        ON CONFLICT (result_id) DO NOTHING
-                    """), row.to_dict())
-            conn.commit()
-            
-        # Finally insert admissions
-        with postgres_client.transaction() as conn:
-            df = test_data['admissions']
-            for _, row in df.iterrows():
-                result = conn.execute(text("""
-                    SELECT patient_id FROM medate_exam.patient_information WHERE patient_id = :patient_id
-                """), {'patient_id': row['patient_id']})
-                if result.scalar() is not None:
-                    conn.execute(text("""
-                        INSERT INTO medate_exam.admissions
-                        (hospitalization_case_number, patient_id, admission_date, admission_time, release_date, release_time, department, room_number)
-                        VALUES (:hospitalization_case_number, :patient_id, :admission_date, :admission_time, :release_date, :release_time, :department, :room_number)
-                        ON CONFLICT (hospitalization_case_number) DO NOTHING
-                    """), row.to_dict())
-            conn.commit()
-        
-        # Upload data to S3
-        for table_name in table_order:
-            df = test_data[table_name]
-            table = pa.Table.from_pandas(df)
-            parquet_buffer = pa.BufferOutputStream()
-            pq.write_table(table, parquet_buffer)
-            
-            s3_key = f"raw/parquet/{table_name}/{table_name}_{timestamp}.parquet"
-            aws_client.s3.put_object(
-                Bucket=config.s3_bucket,
-                Key=s3_key,
-                Body=parquet_buffer.getvalue().to_pybytes()
-            )
-            s3_paths[table_name] = s3_key
+        # Start the S3 uploads first so they run while PostgreSQL is being loaded
+        with ThreadPoolExecutor(max_workers=len(table_order)) as executor:
+            uploads = [executor.submit(upload_table, table_name) for table_name in table_order]
+
+            # Filter child rows in memory against their parents instead of probing the database per row
+            patients = test_data['patient_information']
+            lab_tests = test_data['lab_tests']
+            lab_tests = lab_tests[lab_tests['patient_id'].isin(patients['patient_id'])]
+            lab_results = test_data['lab_results']
+            lab_results = lab_results[lab_results['test_id'].isin(lab_tests['test_id'])]
+            admissions = test_data['admissions']
+            admissions = admissions[admissions['patient_id'].isin(patients['patient_id'])]
+
+            # Insert each table with one multi-row INSERT, parents before children
+            with postgres_client.transaction() as conn:
+                for table_name, df in [('patient_information', patients), ('lab_tests', lab_tests),
+                                       ('lab_results', lab_results), ('admissions', admissions)]:
+                    bulk_insert(conn, table_name, df, db_schema)
+                conn.commit()
+
+            for future in as_completed(uploads):
+                future.result()
 
         yield {
             'timestamp': timestamp,
@@ -192,17 +283,50 @@ def setup_test_data(postgres_client: PostgresClient, aws_client: AWSClient,
         }
 
     finally:
-        # Cleanup test data in reverse order to respect foreign keys
+        # Remove exactly the rows this fixture inserted; key lookups avoid the prefix sweep's scans
         with postgres_client.transaction() as conn:
-            for table_name in cleanup_order:
-                conn.execute(text(f"""
-                    DELETE FROM medate_exam.{table_name}
-                    WHERE {config.table_pk_map[table_name]} LIKE 'TEST%' OR {config.table_pk_map[table_name]} LIKE 'SCHEMA%' OR {config.table_pk_map[table_name]} LIKE 'CRUD%' OR {config.table_pk_map[table_name]} LIKE 'REFL%'
-                """))
+            delete_rows_by_id(conn, {
+                table_name: df[config.table_pk_map[table_name]].tolist()
+                for table_name, df in test_data.items()
+            }, db_schema)
             conn.commit()
-        
-        for s3_key in s3_paths.values():
-            aws_client.delete_s3_object(config.s3_bucket, s3_key)
+        aws_client.delete_s3_objects(config.s3_bucket, list(s3_paths.values()))
+
+@pytest.fixture
+def created_patients(postgres_client: PostgresClient, db_schema: str) -> Generator[List[str], None, None]:
+    """Collect the patient ids a test creates and delete them, with their dependent rows, afterwards."""
+    patient_ids = []
+    yield patient_ids
+    if patient_ids:
+        with postgres_client.transaction() as conn:
+            delete_rows_by_id(conn, {'patient_information': patient_ids}, db_schema)
+            conn.commit()
+
+@pytest.fixture
+def created_s3_keys(aws_client: AWSClient) -> Generator[List[str], None, None]:
+    """Collect the S3 keys a test writes and delete them afterwards."""
+    keys = []
+    yield keys
+    if keys:
+        aws_client.delete_s3_objects(config.s3_bucket, keys)
+
+@pytest.fixture(scope="function")
+def db_session(pg_engine) -> Generator[Session, None, None]:
+    """Run a test inside a transaction that is rolled back afterwards.
+
+    The session joins the outer transaction through a SAVEPOINT, so commits
+    made by the test never reach the database and the session-scoped test
+    data stays intact for the next test.
+    """
+    connection = pg_engine.connect()
+    trans = connection.begin()
+    session = Session(bind=connection, join_transaction_mode="create_savepoint")
+    try:
+        yield session
+    finally:
+        session.close()
+        trans.rollback()
+        connection.close()
 
 @pytest.fixture(scope="session")
 def schema_info(postgres_client: PostgresClient) -> Dict[str, list]:
@@ -215,12 +339,18 @@ def schema_info(postgres_client: PostgresClient) -> Dict[str, list]:
     
     return schema_info
 
-@pytest.fixture
-def download_parquet(tmp_path, aws_client):
-    """Download a Parquet file from S3."""
-    def _download(table_name):
-        key = f"parquet/{table_name}/{table_name}.parquet"
-        local_path = tmp_path / f"{table_name}.parquet"
-        aws_client.s3.download_file(config.s3_bucket, key, str(local_path))
-        return pq.read_table(str(local_path)).to_pandas()
-    return _download 
\ No newline at end of file
+def parquet_key(table_name: str) -> str:
+    """Get the S3 key of the exported Parquet file for a table."""
+    return f"parquet/{table_name}/{table_name}.parquet"
+
+@pytest.fixture(scope="session")
+def download_parquet(aws_client):
+    """Download a Parquet file from S3 once per session, optionally only some of its columns."""
+    cache = {}
+    def _download(table_name, columns=None):
+        cache_key = (table_name, tuple(columns) if columns is not None else None)
+        if cache_key not in cache:
+            cache[cache_key] = aws_client.read_parquet(config.s3_bucket, parquet_key(table_name), columns=columns)
+        # Hand out a shallow copy so a test reassigning columns cannot change the cached frame
+        return cache[cache_key].copy(deep=False)
+    return _download
\ No newline at end of file
@@ -1 +1,8 @@
- 
\ No newline at end of file
+"""
+Pytest configuration and fixtures for data validation testing.
+"""
+import pytest
+
+@pytest.fixture(scope="session", autouse=True)
+def clean_validation_rows(clean_test_rows):
+    """Sweep leftover test rows once per session for every data validation test, not only those using setup_test_data."""
\ No newline at end of file
@@ -2,59 +2,43 @@
 Test schema consistency between PostgreSQL and Parquet.
 """
 import pytest
-import pandas as pd
 import pyarrow as pa
-import pyarrow.parquet as pq
-from sqlalchemy import text
+import pyarrow.types as pat
 import allure
-from datetime import datetime, UTC
-import tempfile
-import os
 
-def get_pg_schema(pg_engine, table_name):
+def get_pg_schema(pg_schemas, table_name):
     """Get schema information from PostgreSQL."""
-    with pg_engine.connect() as conn:
-        result = conn.execute(text(f"""
-            SELECT column_name, data_type
-            FROM information_schema.columns
-            WHERE table_schema = 'medate_exam'
-            AND table_name = '{table_name}'
-            ORDER BY ordinal_position;
-        """))
-        return {row[0]: row[1] for row in result}
+    return pg_schemas[table_name]
 
-def create_sample_parquet(df, tmp_path, table_name):
-    """Create a sample Parquet file from DataFrame."""
-    file_path = os.path.join(tmp_path, f"{table_name}.parquet")
-    table = pa.Table.from_pandas(df)
-    pq.write_table(table, file_path)
-    return file_path
+def _is_text(pa_type) -> bool:
+    """Check for either Arrow string type."""
+    return pat.is_string(pa_type) or pat.is_large_string(pa_type)
 
-def is_compatible_type(pa_type: str, pg_type: str) -> bool:
+# PyArrow type predicates accepted for each PostgreSQL type
+PG_TYPE_CHECKS = {
+    'character varying': _is_text,
+    'text': _is_text,
+    'varchar': _is_text,
+    'double precision': pat.is_floating,
+    'float8': pat.is_floating,
+    'real': pat.is_floating,
+    'integer': pat.is_integer,
+    'int': pat.is_integer,
+    'date': lambda pa_type: pat.is_date(pa_type) or pat.is_timestamp(pa_type) or _is_text(pa_type),
+    'time without time zone': lambda pa_type: pat.is_time(pa_type) or _is_text(pa_type),
+}
+
+def is_compatible_type(pa_type: pa.DataType, pg_type: str) -> bool:
     """Check if PyArrow type is compatible with PostgreSQL type."""
-    pa_type = str(pa_type).lower()
     pg_type = pg_type.lower()
     
-    # Handle string types
-    if pg_type in ['character varying', 'text', 'varchar']:
-        return 'string' in pa_type
-    
-    # Handle numeric types
-    if pg_type in ['double precision', 'float8', 'real']:
-        return 'double' in pa_type or 'float' in pa_type
-    
-    if pg_type in ['integer', 'int']:
-        return 'int' in pa_type
-    
-    # Handle date/time types
-    if pg_type == 'date':
-        return 'date' in pa_type or 'timestamp' in pa_type or 'string' in pa_type
-    
-    if pg_type == 'time without time zone':
-        return 'time' in pa_type or 'string' in pa_type
+    check = PG_TYPE_CHECKS.get(pg_type)
+    if check is not None:
+        return check(pa_type)
     
+    # Any timestamp variant, with or without time zone
     if 'timestamp' in pg_type:
-        return 'timestamp' in pa_type or 'string' in pa_type
+        return pat.is_timestamp(pa_type) or _is_text(pa_type)
     
     return False
 
@@ -64,15 +48,13 @@ def is_compatible_type(pa_type: str, pg_type: str) -> bool:
 @allure.story("Schema Consistency")
 @allure.title("Test schema consistency between PostgreSQL and Parquet")
 @allure.severity(allure.severity_level.CRITICAL)
-def test_schema_consistency(pg_engine, test_data, table_name, tmp_path):
+def test_schema_consistency(pg_schemas, test_data, table_name):
     """Test schema consistency between PostgreSQL and Parquet."""
     # Get PostgreSQL schema
-    pg_schema = get_pg_schema(pg_engine, table_name)
+    pg_schema = get_pg_schema(pg_schemas, table_name)
     
-    # Create sample Parquet file
-    df = test_data[table_name]
-    parquet_path = create_sample_parquet(df, tmp_path, table_name)
-    parquet_schema = pq.read_schema(parquet_path)
+    # Only the schema is compared, so derive it from the sample without writing any rows
+    parquet_schema = pa.Schema.from_pandas(test_data[table_name], preserve_index=False)
     
     # Compare schemas
     for pg_col, pg_type in pg_schema.items():
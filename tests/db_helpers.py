@@ -0,0 +1,78 @@
+"""
+Helpers for reading and removing test rows in the medate_exam schema or a per-worker copy of it.
+"""
+from functools import lru_cache
+from typing import Dict, Iterable, List
+import pandas as pd
+from sqlalchemy import text
+from config.config import get_config
+
+# One statement deletes matching rows from every table, plus any children still
+# referencing a deleted patient or lab test, so foreign keys never block cleanup
+_DELETE_TEST_ROWS = """
+    WITH deleted_patients AS (
+        DELETE FROM {schema}.patient_information
+        WHERE patient_id LIKE ANY(:patterns)
+        RETURNING patient_id
+    ), deleted_tests AS (
+        DELETE FROM {schema}.lab_tests
+        WHERE test_id LIKE ANY(:patterns)
+           OR patient_id IN (SELECT patient_id FROM deleted_patients)
+        RETURNING test_id
+    ), deleted_results AS (
+        DELETE FROM {schema}.lab_results
+        WHERE result_id LIKE ANY(:patterns)
+           OR test_id IN (SELECT test_id FROM deleted_tests)
+    )
+    DELETE FROM {schema}.admissions
+    WHERE hospitalization_case_number LIKE ANY(:patterns)
+       OR patient_id IN (SELECT patient_id FROM deleted_patients)
+"""
+
+# Deletes exactly the given primary keys (and their dependants) through the primary
+# key and foreign key indexes, unlike the prefix sweep which has to scan every table
+_DELETE_ROWS_BY_ID = """
+    WITH deleted_patients AS (
+        DELETE FROM {schema}.patient_information
+        WHERE patient_id = ANY(:patient_information)
+        RETURNING patient_id
+    ), deleted_tests AS (
+        DELETE FROM {schema}.lab_tests
+        WHERE test_id = ANY(:lab_tests)
+           OR patient_id IN (SELECT patient_id FROM deleted_patients)
+        RETURNING test_id
+    ), deleted_results AS (
+        DELETE FROM {schema}.lab_results
+        WHERE result_id = ANY(:lab_results)
+           OR test_id IN (SELECT test_id FROM deleted_tests)
+    )
+    DELETE FROM {schema}.admissions
+    WHERE hospitalization_case_number = ANY(:admissions)
+       OR patient_id IN (SELECT patient_id FROM deleted_patients)
+"""
+
+# Prefix reads for each table
+_READ_TEST_ROWS = {
+    table_name: f"SELECT * FROM {{schema}}.{table_name} WHERE {id_col} LIKE :pattern"
+    for table_name, id_col in get_config().table_pk_map.items()
+}
+
+@lru_cache(maxsize=None)
+def _statement(template: str, schema: str):
+    """Build a statement for a schema once and reuse it across tests."""
+    return text(template.format(schema=schema))
+
+def delete_test_rows(conn, prefixes: Iterable[str], schema: str = 'medate_exam') -> None:
+    """Delete rows whose primary key starts with any of the given prefixes in a single round trip."""
+    conn.execute(_statement(_DELETE_TEST_ROWS, schema), {'patterns': [f"{prefix}%" for prefix in prefixes]})
+
+def delete_rows_by_id(conn, ids: Dict[str, List[str]], schema: str = 'medate_exam') -> None:
+    """Delete the rows with the given primary keys, keyed by table name, in a single round trip."""
+    conn.execute(_statement(_DELETE_ROWS_BY_ID, schema), {
+        table_name: list(ids.get(table_name, ()))
+        for table_name in ('patient_information', 'lab_tests', 'lab_results', 'admissions')
+    })
+
+def read_test_rows(client, table_name: str, prefix: str, schema: str = 'medate_exam') -> pd.DataFrame:
+    """Read only the rows whose primary key starts with ``prefix``, filtering in the database."""
+    return client.read_query(_statement(_READ_TEST_ROWS[table_name], schema), {'pattern': f"{prefix}%"})
\ No newline at end of file